@@ -0,0 +1,15 @@
+"""模拟服务器的ASGI入口，用于在uvicorn（uvloop事件循环 + httptools解析器）下运行server_test.py
+
+    uvicorn --loop uvloop --http httptools --workers 4 --host 0.0.0.0 --port 8080 asgi:app
+
+uvloop不支持Windows，在Windows上改用默认的asyncio事件循环：
+
+    uvicorn --loop asyncio --http httptools --workers 4 --host 0.0.0.0 --port 8080 asgi:app
+
+各接口仍是同步的Flask视图，由a2wsgi在每个进程内最多16个线程的线程池中并发执行。
+"""
+from a2wsgi import WSGIMiddleware
+
+from server_test import app as wsgi_app
+
+app = WSGIMiddleware(wsgi_app, workers=16)
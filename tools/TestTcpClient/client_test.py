@@ -1,431 +1,508 @@
+import asyncio
+import functools
 import requests
+import httpx
 import json
-import time
-from datetime import datetime
+import logging
+import orjson
+import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def log_message(message):
-    """打印带时间戳的日志消息"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"[{timestamp}] {message}")
+# 复用同一个会话，保持HTTP长连接，避免每次请求重新建立TCP连接
+SESSION = requests.Session()
+SESSION.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                     max_retries=Retry(total=2, backoff_factor=0.1)))
 
-def test_system_status(server_ip, server_port):
-    """测试系统状态接口"""
-    url = f"http://{server_ip}:{server_port}/stability/system/status"
+# 全面测试是否直接以HTTP/2（h2c）连接，多个请求复用同一连接并行传输。
+# C++服务端仅支持HTTP/1.1，只有在服务端支持h2c（如hypercorn运行的模拟服务器）时才可开启
+USE_H2C = os.environ.get("STAB_CLIENT_HTTP2") == "1"
+
+# 请求体由orjson预先编码后发送，需显式声明内容类型
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# 各接口路径
+_PATHS = {
+    "status": "/stability/system/status",
+    "device": "/stability/device/state",
+    "support": "/stability/support/control",
+    "height": "/stability/platformHeight/control",
+    "horizontal": "/stability/platformHorizontal/control"
+}
+
+@functools.lru_cache(maxsize=8)
+def _urls(server_ip, server_port):
+    """按服务器地址缓存各接口的完整URL"""
+    return {name: f"http://{server_ip}:{server_port}{path}" for name, path in _PATHS.items()}
+
+logger = logging.getLogger("stab.client")
+
+def _context(title, target, request_data):
+    """构造日志前缀：接口标题、请求地址，以及请求中的平台编号和状态（如有）"""
+    context = f"{title} {target}"
+    if request_data:
+        if "platformNum" in request_data:
+            context += f" 平台{request_data['platformNum']}"
+        if "state" in request_data:
+            context += f" {request_data['state']}"
+    return f"[{context}]"
+
+def _check_response(response, context):
+    """输出响应内容，状态码为200时返回True（兼容requests与httpx的响应对象）
+
+    context为日志前缀，并发执行的请求序列日志会交错，每行都需带上所属请求。
+    """
+    logger.info("%s 请求状态码: %s", context, response.status_code)
     
+    if response.status_code == 200:
+        # 仅在DEBUG级别下解析并格式化返回内容
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s 接口返回: %s", context,
+                         json.dumps(response.json(), ensure_ascii=False, indent=2))
+        return True
+    else:
+        logger.info("%s 请求失败，状态码: %s", context, response.status_code)
+        logger.info("%s 错误信息: %s", context, response.text)
+        return False
+
+def _send(method, url, title, request_data=None):
+    """通过共享会话发送请求并检查响应"""
+    context = _context(title, url, request_data)
     try:
-        log_message(f"测试系统状态接口: {url}")
-        response = requests.get(url, timeout=5)
-        log_message(f"请求状态码: {response.status_code}")
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            log_message(f"接口返回: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
-            return True
+        logger.info("%s: %s", title, url)
+        if request_data is None:
+            response = SESSION.request(method, url, timeout=5)
         else:
-            log_message(f"请求失败，状态码: {response.status_code}")
-            log_message(f"错误信息: {response.text}")
-            return False
+            body = orjson.dumps(request_data)
+            logger.info("%s 请求参数: %s", context, body.decode())
+            response = SESSION.request(method, url, data=body,
+                                       headers=_JSON_HEADERS, timeout=5)
+        return _check_response(response, context)
             
     except requests.exceptions.ConnectionError:
-        log_message("连接被拒绝，服务器可能未启动或端口错误。")
+        logger.info("%s 连接被拒绝，服务器可能未启动或端口错误。", context)
         return False
     except requests.exceptions.Timeout:
-        log_message("请求超时，请检查服务器是否正常运行。")
+        logger.info("%s 请求超时，请检查服务器是否正常运行。", context)
         return False
     except Exception as e:
-        log_message(f"发生错误: {e}")
+        logger.info("%s 发生错误: %s", context, e)
         return False
 
-def test_device_state(server_ip, server_port, fields=None):
-    """测试设备状态接口，可选择性地指定需要返回的字段"""
-    base_url = f"http://{server_ip}:{server_port}/stability/device/state"
-    
-    # 如果指定了字段，添加到URL查询参数
-    url = base_url
-    if fields:
-        url = f"{base_url}?fields={fields}"
-    
+async def _send_async(client, method, path, title, request_data=None):
+    """通过异步客户端发送请求并检查响应，path为相对于base_url的路径"""
+    url = client.base_url.join(path)
+    context = _context(title, url, request_data)
     try:
-        log_message(f"测试设备状态接口: {url}")
-        response = requests.get(url, timeout=5)
-        log_message(f"请求状态码: {response.status_code}")
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            log_message(f"接口返回: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
-            return True
+        logger.info("%s: %s", title, url)
+        if request_data is None:
+            response = await client.request(method, path)
         else:
-            log_message(f"请求失败，状态码: {response.status_code}")
-            log_message(f"错误信息: {response.text}")
-            return False
+            body = orjson.dumps(request_data)
+            logger.info("%s 请求参数: %s", context, body.decode())
+            response = await client.request(method, path, content=body,
+                                            headers=_JSON_HEADERS)
+        return _check_response(response, context)
             
-    except requests.exceptions.ConnectionError:
-        log_message("连接被拒绝，服务器可能未启动或端口错误。")
+    except httpx.ConnectError:
+        logger.info("%s 连接被拒绝，服务器可能未启动或端口错误。", context)
         return False
-    except requests.exceptions.Timeout:
-        log_message("请求超时，请检查服务器是否正常运行。")
+    except httpx.TimeoutException:
+        logger.info("%s 请求超时，请检查服务器是否正常运行。", context)
         return False
     except Exception as e:
-        log_message(f"发生错误: {e}")
+        logger.info("%s 发生错误: %s", context, e)
         return False
 
-def test_support_control(server_ip, server_port, task_id, defect_id, state):
-    """测试支撑控制接口"""
-    url = f"http://{server_ip}:{server_port}/stability/support/control"
-    
-    # 验证state值
+def _support_request(task_id, defect_id, state):
+    """校验支撑控制状态并构造请求参数，state无效时返回None"""
     if state not in ["刚性支撑", "柔性复位"]:
-        log_message(f"无效的支撑控制状态: {state}，有效值为'刚性支撑'或'柔性复位'")
-        return False
+        logger.info("无效的支撑控制状态: %s，有效值为'刚性支撑'或'柔性复位'", state)
+        return None
     
-    # 构造请求参数
-    request_data = {
+    return {
         "state": state,
         "taskId": task_id,
         "defectId": defect_id
     }
-    
-    try:
-        log_message(f"测试支撑控制接口: {url}")
-        log_message(f"请求参数: {json.dumps(request_data, ensure_ascii=False)}")
-        response = requests.post(url, json=request_data, timeout=5)
-        log_message(f"请求状态码: {response.status_code}")
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            log_message(f"接口返回: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
-            return True
-        else:
-            log_message(f"请求失败，状态码: {response.status_code}")
-            log_message(f"错误信息: {response.text}")
-            return False
-            
-    except requests.exceptions.ConnectionError:
-        log_message("连接被拒绝，服务器可能未启动或端口错误。")
-        return False
-    except requests.exceptions.Timeout:
-        log_message("请求超时，请检查服务器是否正常运行。")
-        return False
-    except Exception as e:
-        log_message(f"发生错误: {e}")
-        return False
 
-def test_platform_height_control(server_ip, server_port, task_id, defect_id, platform_num, state):
-    """测试平台高度控制接口"""
-    url = f"http://{server_ip}:{server_port}/stability/platformHeight/control"
-    
+def _platform_height_request(task_id, defect_id, platform_num, state):
+    """校验平台高度控制参数并构造请求参数，参数无效时返回None"""
     # 验证platformNum值
     if platform_num not in [1, 2]:
-        log_message(f"无效的平台编号: {platform_num}，有效值为1或2")
-        return False
+        logger.info("无效的平台编号: %s，有效值为1或2", platform_num)
+        return None
         
     # 验证state值
     if state not in ["升高", "复位"]:
-        log_message(f"无效的平台控制状态: {state}，有效值为'升高'或'复位'")
-        return False
+        logger.info("无效的平台控制状态: %s，有效值为'升高'或'复位'", state)
+        return None
     
-    # 构造请求参数
-    request_data = {
+    return {
         "taskId": task_id,
         "defectId": defect_id,
         "platformNum": platform_num,
         "state": state
     }
-    
-    try:
-        log_message(f"测试平台高度控制接口: {url}")
-        log_message(f"请求参数: {json.dumps(request_data, ensure_ascii=False)}")
-        response = requests.post(url, json=request_data, timeout=5)
-        log_message(f"请求状态码: {response.status_code}")
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            log_message(f"接口返回: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
-            return True
-        else:
-            log_message(f"请求失败，状态码: {response.status_code}")
-            log_message(f"错误信息: {response.text}")
-            return False
-            
-    except requests.exceptions.ConnectionError:
-        log_message("连接被拒绝，服务器可能未启动或端口错误。")
-        return False
-    except requests.exceptions.Timeout:
-        log_message("请求超时，请检查服务器是否正常运行。")
-        return False
-    except Exception as e:
-        log_message(f"发生错误: {e}")
-        return False
 
-def test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, platform_num, state):
-    """测试平台调平控制接口"""
-    url = f"http://{server_ip}:{server_port}/stability/platformHorizontal/control"
-    
+def _platform_horizontal_request(task_id, defect_id, platform_num, state):
+    """校验平台调平控制参数并构造请求参数，参数无效时返回None"""
     # 验证platformNum值
     if platform_num not in [1, 2]:
-        log_message(f"无效的平台编号: {platform_num}，有效值为1或2")
-        return False
+        logger.info("无效的平台编号: %s，有效值为1或2", platform_num)
+        return None
         
     # 验证state值
     if state not in ["调平", "调平复位"]:
-        log_message(f"无效的调平控制状态: {state}，有效值为'调平'或'调平复位'")
-        return False
+        logger.info("无效的调平控制状态: %s，有效值为'调平'或'调平复位'", state)
+        return None
     
-    # 构造请求参数
-    request_data = {
+    return {
         "taskId": task_id,
         "defectId": defect_id,
         "platformNum": platform_num,
         "state": state
     }
+
+def test_system_status(server_ip, server_port):
+    """测试系统状态接口"""
+    url = _urls(server_ip, server_port)["status"]
+    return _send("GET", url, "测试系统状态接口")
+
+def test_device_state(server_ip, server_port, fields=None):
+    """测试设备状态接口，可选择性地指定需要返回的字段"""
+    base_url = _urls(server_ip, server_port)["device"]
     
-    try:
-        log_message(f"测试平台调平控制接口: {url}")
-        log_message(f"请求参数: {json.dumps(request_data, ensure_ascii=False)}")
-        response = requests.post(url, json=request_data, timeout=5)
-        log_message(f"请求状态码: {response.status_code}")
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            log_message(f"接口返回: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
-            return True
-        else:
-            log_message(f"请求失败，状态码: {response.status_code}")
-            log_message(f"错误信息: {response.text}")
-            return False
-            
-    except requests.exceptions.ConnectionError:
-        log_message("连接被拒绝，服务器可能未启动或端口错误。")
+    # 如果指定了字段，添加到URL查询参数
+    url = base_url
+    if fields:
+        url = f"{base_url}?fields={fields}"
+    
+    return _send("GET", url, "测试设备状态接口")
+
+def test_support_control(server_ip, server_port, task_id, defect_id, state):
+    """测试支撑控制接口"""
+    url = _urls(server_ip, server_port)["support"]
+    
+    request_data = _support_request(task_id, defect_id, state)
+    if request_data is None:
         return False
-    except requests.exceptions.Timeout:
-        log_message("请求超时，请检查服务器是否正常运行。")
+    
+    return _send("POST", url, "测试支撑控制接口", request_data)
+
+def test_platform_height_control(server_ip, server_port, task_id, defect_id, platform_num, state):
+    """测试平台高度控制接口"""
+    url = _urls(server_ip, server_port)["height"]
+    
+    request_data = _platform_height_request(task_id, defect_id, platform_num, state)
+    if request_data is None:
         return False
-    except Exception as e:
-        log_message(f"发生错误: {e}")
+    
+    return _send("POST", url, "测试平台高度控制接口", request_data)
+
+def test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, platform_num, state):
+    """测试平台调平控制接口"""
+    url = _urls(server_ip, server_port)["horizontal"]
+    
+    request_data = _platform_horizontal_request(task_id, defect_id, platform_num, state)
+    if request_data is None:
+        return False
+    
+    return _send("POST", url, "测试平台调平控制接口", request_data)
+
+async def test_system_status_async(client):
+    """测试系统状态接口（异步版本）"""
+    return await _send_async(client, "GET", _PATHS["status"], "测试系统状态接口")
+
+async def test_device_state_async(client, fields=None):
+    """测试设备状态接口（异步版本），可选择性地指定需要返回的字段"""
+    path = _PATHS["device"]
+    if fields:
+        path = f"{path}?fields={fields}"
+    
+    return await _send_async(client, "GET", path, "测试设备状态接口")
+
+async def test_support_control_async(client, task_id, defect_id, state):
+    """测试支撑控制接口（异步版本）"""
+    request_data = _support_request(task_id, defect_id, state)
+    if request_data is None:
+        return False
+    
+    return await _send_async(client, "POST", _PATHS["support"], "测试支撑控制接口", request_data)
+
+async def test_platform_height_control_async(client, task_id, defect_id, platform_num, state):
+    """测试平台高度控制接口（异步版本）"""
+    request_data = _platform_height_request(task_id, defect_id, platform_num, state)
+    if request_data is None:
+        return False
+    
+    return await _send_async(client, "POST", _PATHS["height"], "测试平台高度控制接口", request_data)
+
+async def test_platform_horizontal_control_async(client, task_id, defect_id, platform_num, state):
+    """测试平台调平控制接口（异步版本）"""
+    request_data = _platform_horizontal_request(task_id, defect_id, platform_num, state)
+    if request_data is None:
         return False
+    
+    return await _send_async(client, "POST", _PATHS["horizontal"], "测试平台调平控制接口", request_data)
 
 def test_callback_server(callback_ip, callback_port):
     """测试回调服务器是否可用"""
     url = f"http://{callback_ip}:{callback_port}/health"
     
     try:
-        log_message(f"测试回调服务器: {url}")
-        response = requests.get(url, timeout=5)
-        log_message(f"请求状态码: {response.status_code}")
+        logger.info("测试回调服务器: %s", url)
+        response = SESSION.get(url, timeout=5)
+        logger.info("请求状态码: %s", response.status_code)
         
         if response.status_code == 200:
-            response_data = response.json()
-            log_message(f"回调服务器状态: {json.dumps(response_data, ensure_ascii=False, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("回调服务器状态: %s", json.dumps(response.json(), ensure_ascii=False, indent=2))
             return True
         else:
-            log_message(f"回调服务器不可用，状态码: {response.status_code}")
+            logger.info("回调服务器不可用，状态码: %s", response.status_code)
             return False
             
     except requests.exceptions.ConnectionError:
-        log_message("连接被拒绝，回调服务器可能未启动或端口错误。")
+        logger.info("连接被拒绝，回调服务器可能未启动或端口错误。")
         return False
     except requests.exceptions.Timeout:
-        log_message("请求超时，请检查回调服务器是否正常运行。")
+        logger.info("请求超时，请检查回调服务器是否正常运行。")
         return False
     except Exception as e:
-        log_message(f"发生错误: {e}")
+        logger.info("发生错误: %s", e)
         return False
 
-def run_comprehensive_test(server_ip, server_port, task_id, defect_id):
-    """运行全面的接口测试"""
-    
-    # 测试系统状态
-    if not test_system_status(server_ip, server_port):
-        log_message("系统状态接口测试失败，终止后续测试")
-        return
+async def _run_in_order(*commands):
+    """依次执行针对同一资源的控制命令，相邻命令间隔一秒"""
+    for index, command in enumerate(commands):
+        if index:
+            await asyncio.sleep(1)  # 间隔一秒
+        await command
+
+async def run_comprehensive_test(server_ip, server_port, task_id, defect_id):
+    """运行全面的接口测试，互不依赖的请求并发执行"""
+    limits = httpx.Limits(max_keepalive_connections=8)
+    async with httpx.AsyncClient(base_url=f"http://{server_ip}:{server_port}", http1=not USE_H2C,
+                                 http2=USE_H2C, timeout=5, limits=limits) as client:
+        # 并发测试系统状态、设备状态（完整状态与过滤字段）
+        status_ok, _, _ = await asyncio.gather(
+            test_system_status_async(client),
+            test_device_state_async(client),
+            test_device_state_async(client, "operationMode,emergencyStop,cylinderState,platform1State,platform2State")
+        )
+        if not status_ok:
+            logger.info("系统状态接口测试失败，终止后续测试")
+            return
         
-    # 测试设备状态 - 完整状态
-    test_device_state(server_ip, server_port)
-    
-    # 测试设备状态 - 过滤字段
-    test_device_state(server_ip, server_port, "operationMode,emergencyStop,cylinderState,platform1State,platform2State")
-    
-    # 测试支撑控制
-    test_support_control(server_ip, server_port, task_id, defect_id, "刚性支撑")
-    time.sleep(1)  # 间隔一秒
-    test_support_control(server_ip, server_port, task_id, defect_id, "柔性复位")
+        # 不同资源的控制命令并发执行，同一资源（支撑油缸、各平台）的命令按顺序执行
+        await asyncio.gather(
+            # 测试支撑控制
+            _run_in_order(
+                test_support_control_async(client, task_id, defect_id, "刚性支撑"),
+                test_support_control_async(client, task_id, defect_id, "柔性复位")
+            ),
+            # 测试平台1、平台2的高度控制和调平控制
+            *(_run_in_order(
+                test_platform_height_control_async(client, task_id, defect_id, platform_num, "升高"),
+                test_platform_height_control_async(client, task_id, defect_id, platform_num, "复位"),
+                test_platform_horizontal_control_async(client, task_id, defect_id, platform_num, "调平"),
+                test_platform_horizontal_control_async(client, task_id, defect_id, platform_num, "调平复位")
+            ) for platform_num in (1, 2))
+        )
     
-    # 测试平台高度控制
-    test_platform_height_control(server_ip, server_port, task_id, defect_id, 1, "升高")
-    time.sleep(1)  # 间隔一秒
-    test_platform_height_control(server_ip, server_port, task_id, defect_id, 1, "复位")
-    time.sleep(1)  # 间隔一秒
-    test_platform_height_control(server_ip, server_port, task_id, defect_id, 2, "升高")
-    time.sleep(1)  # 间隔一秒
-    test_platform_height_control(server_ip, server_port, task_id, defect_id, 2, "复位")
-    
-    # 测试平台调平控制
-    test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 1, "调平")
-    time.sleep(1)  # 间隔一秒
-    test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 1, "调平复位")
-    time.sleep(1)  # 间隔一秒
-    test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 2, "调平")
-    time.sleep(1)  # 间隔一秒
-    test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 2, "调平复位")
-    
-    log_message("全面接口测试完成")
+    logger.info("全面接口测试完成")
 
 def get_int_input(prompt, default=None):
-    """获取整数输入，带有默认值"""
-    if default is not None:
-        value = input(f"{prompt} [{default}]: ")
-        if value.strip() == "":
+    """获取整数输入，带有默认值，输入无效时重新提示"""
+    prompt_text = f"{prompt} [{default}]: " if default is not None else f"{prompt}: "
+    while True:
+        value = input(prompt_text).strip()
+        if not value and default is not None:
             return default
         try:
             return int(value)
         except ValueError:
             print("输入无效，请输入数字")
-            return get_int_input(prompt, default)
-    else:
-        try:
-            return int(input(f"{prompt}: "))
-        except ValueError:
-            print("输入无效，请输入数字")
-            return get_int_input(prompt)
+
+MENU_TEXT = "\n".join([
+    "\n" + "="*60,
+    "稳定性系统接口测试工具".center(50),
+    "="*60,
+    "1. 测试系统状态接口 (/stability/system/status)",
+    "2. 测试设备状态接口 (/stability/device/state)",
+    "3. 测试支撑控制接口 (/stability/support/control)",
+    "4. 测试平台高度控制接口 (/stability/platformHeight/control)",
+    "5. 测试平台调平控制接口 (/stability/platformHorizontal/control)",
+    "6. 测试所有接口",
+    "7. 修改服务器设置",
+    "0. 退出程序",
+    "="*60
+])
+
+SUPPORT_MENU_TEXT = "\n".join([
+    "\n---支撑控制选项---",
+    "1. 刚性支撑",
+    "2. 柔性复位",
+    "0. 返回主菜单"
+])
+
+PLATFORM_HEIGHT_MENU_TEXT = "\n".join([
+    "\n---平台高度控制选项---",
+    "1. 平台1-升高",
+    "2. 平台1-复位",
+    "3. 平台2-升高",
+    "4. 平台2-复位",
+    "0. 返回主菜单"
+])
+
+PLATFORM_LEVEL_MENU_TEXT = "\n".join([
+    "\n---平台调平控制选项---",
+    "1. 平台1-调平",
+    "2. 平台1-调平复位",
+    "3. 平台2-调平",
+    "4. 平台2-调平复位",
+    "0. 返回主菜单"
+])
+
+DEVICE_FIELDS_TEXT = "\n".join([
+    "\n可用字段: operationMode, emergencyStop, oilPumpStatus, cylinderState, platform1State, platform2State",
+    "          heaterStatus, coolingStatus, leveling1Status, leveling2Status",
+    "          cylinderPressure, liftPressure, platform1TiltAngle, platform2TiltAngle",
+    "          platform1Position, platform2Position, timestamp"
+])
+
+# 子菜单选项对应的控制参数
+_SUPPORT_ACTIONS = {1: "刚性支撑", 2: "柔性复位"}
+_PLATFORM_HEIGHT_ACTIONS = {1: (1, "升高"), 2: (1, "复位"), 3: (2, "升高"), 4: (2, "复位")}
+_PLATFORM_LEVEL_ACTIONS = {1: (1, "调平"), 2: (1, "调平复位"), 3: (2, "调平"), 4: (2, "调平复位")}
 
 def show_menu():
     """显示主菜单"""
-    print("\n" + "="*60)
-    print("稳定性系统接口测试工具".center(50))
-    print("="*60)
-    print("1. 测试系统状态接口 (/stability/system/status)")
-    print("2. 测试设备状态接口 (/stability/device/state)")
-    print("3. 测试支撑控制接口 (/stability/support/control)")
-    print("4. 测试平台高度控制接口 (/stability/platformHeight/control)")
-    print("5. 测试平台调平控制接口 (/stability/platformHorizontal/control)")
-    print("6. 测试所有接口")
-    print("7. 修改服务器设置")
-    print("0. 退出程序")
-    print("="*60)
+    print(MENU_TEXT)
     return get_int_input("请输入选项编号", 0)
 
 def show_support_menu():
     """显示支撑控制菜单"""
-    print("\n---支撑控制选项---")
-    print("1. 刚性支撑")
-    print("2. 柔性复位")
-    print("0. 返回主菜单")
+    print(SUPPORT_MENU_TEXT)
     return get_int_input("请选择操作", 0)
 
 def show_platform_height_menu():
     """显示平台高度控制菜单"""
-    print("\n---平台高度控制选项---")
-    print("1. 平台1-升高")
-    print("2. 平台1-复位")
-    print("3. 平台2-升高")
-    print("4. 平台2-复位")
-    print("0. 返回主菜单")
+    print(PLATFORM_HEIGHT_MENU_TEXT)
     return get_int_input("请选择操作", 0)
 
 def show_platform_level_menu():
     """显示平台调平控制菜单"""
-    print("\n---平台调平控制选项---")
-    print("1. 平台1-调平")
-    print("2. 平台1-调平复位")
-    print("3. 平台2-调平")
-    print("4. 平台2-调平复位")
-    print("0. 返回主菜单")
+    print(PLATFORM_LEVEL_MENU_TEXT)
     return get_int_input("请选择操作", 0)
 
+def handle_status(settings):
+    """测试系统状态"""
+    test_system_status(settings["server_ip"], settings["server_port"])
+
+def handle_device(settings):
+    """测试设备状态"""
+    print(DEVICE_FIELDS_TEXT)
+    fields = input("请输入需要返回的字段，多个字段用逗号分隔（直接回车返回全部字段）: ")
+    if fields.strip():
+        test_device_state(settings["server_ip"], settings["server_port"], fields)
+    else:
+        test_device_state(settings["server_ip"], settings["server_port"])
+
+def handle_support(settings):
+    """测试支撑控制"""
+    state = _SUPPORT_ACTIONS.get(show_support_menu())
+    if state is not None:
+        test_support_control(settings["server_ip"], settings["server_port"],
+                             settings["task_id"], settings["defect_id"], state)
+
+def handle_platform_height(settings):
+    """测试平台高度控制"""
+    action = _PLATFORM_HEIGHT_ACTIONS.get(show_platform_height_menu())
+    if action is not None:
+        test_platform_height_control(settings["server_ip"], settings["server_port"],
+                                     settings["task_id"], settings["defect_id"], *action)
+
+def handle_platform_level(settings):
+    """测试平台调平控制"""
+    action = _PLATFORM_LEVEL_ACTIONS.get(show_platform_level_menu())
+    if action is not None:
+        test_platform_horizontal_control(settings["server_ip"], settings["server_port"],
+                                         settings["task_id"], settings["defect_id"], *action)
+
+def handle_comprehensive(settings):
+    """测试所有接口"""
+    print("\n开始执行全面测试...")
+    asyncio.run(run_comprehensive_test(settings["server_ip"], settings["server_port"],
+                                       settings["task_id"], settings["defect_id"]))
+
+def handle_settings(settings):
+    """修改服务器设置"""
+    print("\n当前服务器设置:")
+    print(f"服务器IP: {settings['server_ip']}")
+    print(f"服务器端口: {settings['server_port']}")
+    print(f"任务ID: {settings['task_id']}")
+    print(f"缺陷ID: {settings['defect_id']}")
+    print("\n输入新的设置（直接回车保留当前值）:")
+    
+    new_ip = input(f"服务器IP [{settings['server_ip']}]: ")
+    if new_ip.strip():
+        settings["server_ip"] = new_ip
+        
+    settings["server_port"] = get_int_input("服务器端口", settings["server_port"])
+    settings["task_id"] = get_int_input("任务ID", settings["task_id"])
+    settings["defect_id"] = get_int_input("缺陷ID", settings["defect_id"])
+    
+    print("\n新的服务器设置已保存")
+
+# 主菜单选项 -> 处理函数
+DISPATCH = {
+    1: handle_status,
+    2: handle_device,
+    3: handle_support,
+    4: handle_platform_height,
+    5: handle_platform_level,
+    6: handle_comprehensive,
+    7: handle_settings
+}
+
 def main():
     """主函数，交互式菜单"""
+    # 日志级别可通过环境变量STAB_CLIENT_LOG_LEVEL调整，设为DEBUG时输出接口返回内容
+    logging.basicConfig(format='[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    level = os.environ.get("STAB_CLIENT_LOG_LEVEL", "INFO").upper()
+    if level not in logging.getLevelNamesMapping():
+        print(f"无效的日志级别: {level}，使用默认级别INFO")
+        level = "INFO"
+    logger.setLevel(level)
+    
     # 默认设置
-    server_ip = "192.168.6.130"
-    server_port = 8080
-    task_id = 125
-    defect_id = 91
+    settings = {
+        "server_ip": "192.168.6.130",
+        "server_port": 8080,
+        "task_id": 125,
+        "defect_id": 91
+    }
     
-    while True:
-        choice = show_menu()
-        
-        if choice == 0:
-            print("程序已退出")
-            break
-            
-        elif choice == 1:  # 测试系统状态
-            test_system_status(server_ip, server_port)
-            input("按回车键继续...")
-            
-        elif choice == 2:  # 测试设备状态
-            print("\n可用字段: operationMode, emergencyStop, oilPumpStatus, cylinderState, platform1State, platform2State")
-            print("          heaterStatus, coolingStatus, leveling1Status, leveling2Status")
-            print("          cylinderPressure, liftPressure, platform1TiltAngle, platform2TiltAngle")
-            print("          platform1Position, platform2Position, timestamp")
-            fields = input("请输入需要返回的字段，多个字段用逗号分隔（直接回车返回全部字段）: ")
-            if fields.strip():
-                test_device_state(server_ip, server_port, fields)
-            else:
-                test_device_state(server_ip, server_port)
-            input("按回车键继续...")
-            
-        elif choice == 3:  # 测试支撑控制
-            sub_choice = show_support_menu()
-            if sub_choice == 1:
-                test_support_control(server_ip, server_port, task_id, defect_id, "刚性支撑")
-            elif sub_choice == 2:
-                test_support_control(server_ip, server_port, task_id, defect_id, "柔性复位")
-            input("按回车键继续...")
-            
-        elif choice == 4:  # 测试平台高度控制
-            sub_choice = show_platform_height_menu()
-            if sub_choice == 1:
-                test_platform_height_control(server_ip, server_port, task_id, defect_id, 1, "升高")
-            elif sub_choice == 2:
-                test_platform_height_control(server_ip, server_port, task_id, defect_id, 1, "复位")
-            elif sub_choice == 3:
-                test_platform_height_control(server_ip, server_port, task_id, defect_id, 2, "升高")
-            elif sub_choice == 4:
-                test_platform_height_control(server_ip, server_port, task_id, defect_id, 2, "复位")
-            input("按回车键继续...")
-            
-        elif choice == 5:  # 测试平台调平控制
-            sub_choice = show_platform_level_menu()
-            if sub_choice == 1:
-                test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 1, "调平")
-            elif sub_choice == 2:
-                test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 1, "调平复位")
-            elif sub_choice == 3:
-                test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 2, "调平")
-            elif sub_choice == 4:
-                test_platform_horizontal_control(server_ip, server_port, task_id, defect_id, 2, "调平复位")
-            input("按回车键继续...")
-            
-        elif choice == 6:  # 测试所有接口
-            print("\n开始执行全面测试...")
-            run_comprehensive_test(server_ip, server_port, task_id, defect_id)
-            input("按回车键继续...")
-            
-        elif choice == 7:  # 修改服务器设置
-            print("\n当前服务器设置:")
-            print(f"服务器IP: {server_ip}")
-            print(f"服务器端口: {server_port}")
-            print(f"任务ID: {task_id}")
-            print(f"缺陷ID: {defect_id}")
-            print("\n输入新的设置（直接回车保留当前值）:")
-            
-            new_ip = input(f"服务器IP [{server_ip}]: ")
-            if new_ip.strip():
-                server_ip = new_ip
-                
-            new_port = get_int_input(f"服务器端口", server_port)
-            server_port = new_port
+    try:
+        while True:
+            choice = show_menu()
             
-            new_task_id = get_int_input(f"任务ID", task_id)
-            task_id = new_task_id
+            if choice == 0:
+                print("程序已退出")
+                break
             
-            new_defect_id = get_int_input(f"缺陷ID", defect_id)
-            defect_id = new_defect_id
+            handler = DISPATCH.get(choice)
+            if handler is None:
+                print("无效的选项，请重新输入")
+                continue
             
-            print("\n新的服务器设置已保存")
+            handler(settings)
             input("按回车键继续...")
-            
-        else:
-            print("无效的选项，请重新输入")
-            
+    finally:
+        SESSION.close()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,15 +1,246 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request
+from flask.json.provider import JSONProvider
+import functools
+import io
+import jsonschema_rs
 import logging
+import orjson
+import sys
+import threading
+import time
 from datetime import datetime
+from logging.handlers import MemoryHandler
 
-# 修改日志配置
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] [%(levelname)s] %(message)s',
+
+class _StderrBuffer(io.BufferedWriter):
+    """包装sys.stderr.buffer的写缓冲，关闭时只刷新，不关闭sys.stderr"""
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """只写入缓冲区，不在每条日志后刷新，由MemoryHandler批量刷新"""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchMemoryHandler(MemoryHandler):
+    """批量输出缓存的日志后统一刷新目标流，合并write()系统调用"""
+
+    def flush(self):
+        super().flush()
+        with self.lock:
+            if self.target:
+                self.target.flush()
+
+
+def _flush_logs_periodically(handler, interval=0.2):
+    """后台线程定时刷新日志缓冲，避免低负载时日志长时间不输出"""
+    while True:
+        time.sleep(interval)
+        handler.flush()
+
+
+# 修改日志配置：日志先缓存在内存中，每256条、遇到ERROR或每200ms写出一次
+# 经由sys.stderr.buffer输出并沿用其编码，Windows控制台下中文也能正常显示
+_log_stream = io.TextIOWrapper(_StderrBuffer(sys.stderr.buffer, 65536), encoding=sys.stderr.encoding,
+                               errors=sys.stderr.errors, write_through=False)
+_stream_handler = _BufferedStreamHandler(_log_stream)
+_stream_handler.setFormatter(logging.Formatter(
+    fmt='[%(asctime)s] [%(levelname)s] %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'  # 修改这里，移除了毫秒部分
-)
+))
+_log_handler = _BatchMemoryHandler(capacity=256, flushLevel=logging.ERROR, target=_stream_handler)
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(_log_handler)
+threading.Thread(target=_flush_logs_periodically, args=(_log_handler,), daemon=True).start()
+# 不输出Werkzeug每个请求的访问日志
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+
+
+class OrjsonProvider(JSONProvider):
+    """使用orjson完成请求体解析和响应序列化"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class StabApp(Flask):
+    json_provider_class = OrjsonProvider
 
-app = Flask(__name__)
+
+app = StabApp(__name__)
+
+# 模拟的设备状态数据，字段名与C++接口保持一致
+_STATIC_DEVICE_DATA = {
+    "operationMode": "手动",
+    "emergencyStop": "正常",
+    "oilPumpStatus": "停止",
+    "cylinderState": "上升停止",
+    "platform1State": "上升停止",
+    "platform2State": "下降停止",
+    "heaterStatus": "停止",
+    "coolingStatus": "停止",
+    "leveling1Status": "停止",
+    "leveling2Status": "停止",
+    "cylinderPressure": 0.0,
+    "liftPressure": 0.0,
+    "platform1TiltAngle": 0.0,
+    "platform2TiltAngle": 0.0,
+    "platform1Position": 0.0,
+    "platform2Position": 0.0
+}
+_DEVICE_FIELDS = frozenset(_STATIC_DEVICE_DATA)
+
+
+@functools.lru_cache(maxsize=64)
+def _device_subset(fields):
+    """解析fields参数并取出对应的设备数据，同一组字段只解析一次"""
+    return {k: _STATIC_DEVICE_DATA[k] for k in fields.split(',') if k in _DEVICE_FIELDS}
+
+# 按秒缓存的ISO格式时间字符串：(秒级时间戳, 格式化结果)，整体替换以保证多线程下一致
+_TS_CACHE = (0, "")
+
+
+def now_iso():
+    """返回当前时间的ISO格式字符串（秒级精度），同一秒内复用格式化结果"""
+    global _TS_CACHE
+    t = int(time.time())
+    cached = _TS_CACHE
+    if cached[0] != t:
+        cached = _TS_CACHE = (t, datetime.fromtimestamp(t).isoformat())
+    return cached[1]
+
+
+def ojson(obj, status=200):
+    """使用orjson序列化响应数据，返回JSON响应"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
+def raw_json(body, status=200):
+    """直接返回已序列化的JSON响应体"""
+    return Response(body, status=status, mimetype='application/json', direct_passthrough=True)
+
+
+# 控制接口固定的响应体，模块加载时序列化一次
+_OK_BYTES = orjson.dumps({"msg": "success", "code": 200})
+_ERR_SUPPORT_INCOMPLETE = orjson.dumps({
+    "msg": "error",
+    "code": 400,
+    "error": "请求参数不完整，需要taskId, defectId和state字段"
+})
+_ERR_SUPPORT_STATE = orjson.dumps({
+    "msg": "error",
+    "code": 400,
+    "error": "无效的state值，必须为'刚性支撑'或'柔性复位'"
+})
+_ERR_PLATFORM_INCOMPLETE = orjson.dumps({
+    "msg": "error",
+    "code": 400,
+    "error": "请求参数不完整，需要taskId, defectId, platformNum和state字段"
+})
+_ERR_PLATFORM_NUM = orjson.dumps({
+    "msg": "error",
+    "code": 400,
+    "error": "无效的platformNum值，必须为1或2"
+})
+_ERR_HEIGHT_STATE = orjson.dumps({
+    "msg": "error",
+    "code": 400,
+    "error": "无效的state值，必须为'升高'或'复位'"
+})
+_ERR_HORIZONTAL_STATE = orjson.dumps({
+    "msg": "error",
+    "code": 400,
+    "error": "无效的state值，必须为'调平'或'调平复位'"
+})
+
+
+def ok():
+    """控制接口成功响应"""
+    return raw_json(_OK_BYTES)
+
+
+# 各控制接口请求体的JSON Schema
+_SUPPORT_SCHEMA = jsonschema_rs.validator_for({
+    "type": "object",
+    "required": ["taskId", "defectId", "state"],
+    "properties": {
+        "taskId": {"not": {"type": "null"}},
+        "defectId": {"not": {"type": "null"}},
+        "state": {"enum": ["刚性支撑", "柔性复位"]}
+    }
+})
+_HEIGHT_SCHEMA = jsonschema_rs.validator_for({
+    "type": "object",
+    "required": ["taskId", "defectId", "platformNum", "state"],
+    "properties": {
+        "taskId": {"not": {"type": "null"}},
+        "defectId": {"not": {"type": "null"}},
+        "platformNum": {"enum": [1, 2]},
+        "state": {"enum": ["升高", "复位"]}
+    }
+})
+_HORIZONTAL_SCHEMA = jsonschema_rs.validator_for({
+    "type": "object",
+    "required": ["taskId", "defectId", "platformNum", "state"],
+    "properties": {
+        "taskId": {"not": {"type": "null"}},
+        "defectId": {"not": {"type": "null"}},
+        "platformNum": {"enum": [1, 2]},
+        "state": {"enum": ["调平", "调平复位"]}
+    }
+})
+
+
+def validate(schema, invalid_responses, truthy=("state",)):
+    """按schema校验请求体，通过后将其保存到g.data，否则返回对应的400响应
+
+    invalid_responses按检查优先级排列，键为出错的字段名，值为(日志格式, 响应体)；
+    键None对应请求体缺失或参数不完整：字段缺失、取值为null，或truthy中的字段取假值（如0、false、空字符串）。
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+
+            # 记录每个出错字段及其取值
+            errors = {}
+            for error in schema.iter_errors(data):
+                field = error.instance_path[0] if error.instance_path else None
+                if (field not in invalid_responses or error.instance is None
+                        or (field in truthy and not error.instance)):
+                    field = None
+                errors.setdefault(field, error.instance)
+
+            for field, (log_fmt, body) in invalid_responses.items():
+                if field in errors:
+                    if field is None:
+                        logging.error(log_fmt)
+                    else:
+                        logging.error(log_fmt, errors[field])
+                    return raw_json(body, 400)
+
+            g.data = data
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# 设备状态响应缓存：fields参数 -> (生成时间, 序列化后的响应体)
+_DEV_CACHE = {}
+_DEV_TTL = 0.25
+_DEV_CACHE_MAX = 64
 
 
 @app.route('/business/task/stability/platformHeight/cback', methods=['POST'])
@@ -21,10 +252,10 @@ def platform_height_callback():
         platform_num = data.get('platformNum')
         state = data.get('state')
 
-        logging.info(f"收到平台高度回调 - 任务ID: {task_id}, 缺陷ID: {defect_id}, "
-                     f"平台号: {platform_num}, 状态: {state}")
+        logging.info("收到平台高度回调 - 任务ID: %s, 缺陷ID: %s, "
+                     "平台号: %s, 状态: %s", task_id, defect_id, platform_num, state)
 
-        return jsonify({
+        return ojson({
             "code": 200,
             "msg": "平台高度回调处理成功",
             "data": {
@@ -32,15 +263,15 @@ def platform_height_callback():
                 "defectId": defect_id,
                 "platformNum": platform_num,
                 "state": state,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         })
     except Exception as e:
-        logging.error(f"处理平台高度回调时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理平台高度回调时发生错误: %s", e)
+        return ojson({
             "code": 500,
             "msg": f"处理回调时发生错误: {str(e)}"
-        }), 500
+        }, 500)
 
 
 @app.route('/business/task/stability/support/cback', methods=['POST'])
@@ -51,24 +282,24 @@ def support_callback():
         defect_id = data.get('defectId')
         state = data.get('state')
 
-        logging.info(f"收到支撑回调 - 任务ID: {task_id}, 缺陷ID: {defect_id}, 状态: {state}")
+        logging.info("收到支撑回调 - 任务ID: %s, 缺陷ID: %s, 状态: %s", task_id, defect_id, state)
 
-        return jsonify({
+        return ojson({
             "code": 200,
             "msg": "支撑回调处理成功",
             "data": {
                 "taskId": task_id,
                 "defectId": defect_id,
                 "state": state,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         })
     except Exception as e:
-        logging.error(f"处理支撑回调时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理支撑回调时发生错误: %s", e)
+        return ojson({
             "code": 500,
             "msg": f"处理回调时发生错误: {str(e)}"
-        }), 500
+        }, 500)
 
 
 @app.route('/business/task/stability/platformHorizontal/cback', methods=['POST'])
@@ -80,10 +311,10 @@ def platform_horizontal_callback():
         platform_num = data.get('platformNum')
         state = data.get('state')
 
-        logging.info(f"收到平台水平回调 - 任务ID: {task_id}, 缺陷ID: {defect_id}, "
-                     f"平台号: {platform_num}, 状态: {state}")
+        logging.info("收到平台水平回调 - 任务ID: %s, 缺陷ID: %s, "
+                     "平台号: %s, 状态: %s", task_id, defect_id, platform_num, state)
 
-        return jsonify({
+        return ojson({
             "code": 200,
             "msg": "平台水平回调处理成功",
             "data": {
@@ -91,205 +322,125 @@ def platform_horizontal_callback():
                 "defectId": defect_id,
                 "platformNum": platform_num,
                 "state": state,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         })
     except Exception as e:
-        logging.error(f"处理平台水平回调时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理平台水平回调时发生错误: %s", e)
+        return ojson({
             "code": 500,
             "msg": f"处理回调时发生错误: {str(e)}"
-        }), 500
+        }, 500)
 
 @app.route('/stability/device/state', methods=['GET'])
 def device_state():
     # 获取请求中的fields参数
     fields = request.args.get('fields', '')
-    logging.info(f"收到设备状态请求, 过滤字段: {fields}")
-
-    # 创建一个模拟的设备状态数据，字段名与C++接口保持一致
-    device_data = {
-        "msg": "success",
-        "code": 200,
-        "operationMode": "手动",
-        "emergencyStop": "正常",
-        "oilPumpStatus": "停止",
-        "cylinderState": "上升停止",
-        "platform1State": "上升停止",
-        "platform2State": "下降停止",
-        "heaterStatus": "停止",
-        "coolingStatus": "停止",
-        "leveling1Status": "停止",
-        "leveling2Status": "停止",
-        "cylinderPressure": 0.0,
-        "liftPressure": 0.0,
-        "platform1TiltAngle": 0.0,
-        "platform2TiltAngle": 0.0,
-        "platform1Position": 0.0,
-        "platform2Position": 0.0,
-        "timestamp": int(datetime.now().timestamp() * 1000)
-    }
+    logging.info("收到设备状态请求, 过滤字段: %s", fields)
 
-    # 如果有fields参数，过滤返回的字段
+    # 缓存未过期时直接返回已序列化的响应
+    now = time.monotonic()
+    cached = _DEV_CACHE.get(fields)
+    if cached is not None and now - cached[0] < _DEV_TTL:
+        return raw_json(cached[1])
+
+    # 如果有fields参数，只返回请求的字段
     if fields:
-        field_list = fields.split(',')
-        filtered_data = {
+        device_data = {
             "msg": "success",
             "code": 200,
-            "timestamp": int(datetime.now().timestamp() * 1000)
+            "timestamp": time.time_ns() // 1_000_000,
+            **_device_subset(fields)
+        }
+    else:
+        device_data = {
+            "msg": "success",
+            "code": 200,
+            **_STATIC_DEVICE_DATA,
+            "timestamp": time.time_ns() // 1_000_000
         }
-        for field in field_list:
-            if field in device_data:
-                filtered_data[field] = device_data[field]
-        return jsonify(filtered_data)
 
-    return jsonify(device_data)
+    body = orjson.dumps(device_data)
+    if len(_DEV_CACHE) >= _DEV_CACHE_MAX:
+        _DEV_CACHE.clear()
+    _DEV_CACHE[fields] = (now, body)
+    return raw_json(body)
 
 
 @app.route('/stability/support/control', methods=['POST'])
+@validate(_SUPPORT_SCHEMA, {
+    None: ("支撑控制请求参数不完整", _ERR_SUPPORT_INCOMPLETE),
+    "state": ("无效的支撑控制状态: %s", _ERR_SUPPORT_STATE)
+})
 def support_control():
     try:
-        data = request.get_json()
-        task_id = data.get('taskId')
-        defect_id = data.get('defectId')
-        state = data.get('state')
-        
-        # 验证参数
-        if not all([task_id is not None, defect_id is not None, state]):
-            logging.error("支撑控制请求参数不完整")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "请求参数不完整，需要taskId, defectId和state字段"
-            }), 400
-            
-        # 验证state值
-        if state not in ["刚性支撑", "柔性复位"]:
-            logging.error(f"无效的支撑控制状态: {state}")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "无效的state值，必须为'刚性支撑'或'柔性复位'"
-            }), 400
+        task_id = g.data['taskId']
+        defect_id = g.data['defectId']
+        state = g.data['state']
         
-        logging.info(f"收到支撑控制请求 - 任务ID: {task_id}, 缺陷ID: {defect_id}, 状态: {state}")
+        logging.info("收到支撑控制请求 - 任务ID: %s, 缺陷ID: %s, 状态: %s", task_id, defect_id, state)
         
-        return jsonify({
-            "msg": "success",
-            "code": 200
-        })
+        return ok()
     except Exception as e:
-        logging.error(f"处理支撑控制请求时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理支撑控制请求时发生错误: %s", e)
+        return ojson({
             "msg": "error",
             "code": 500,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
 
 @app.route('/stability/platformHeight/control', methods=['POST'])
+@validate(_HEIGHT_SCHEMA, {
+    None: ("平台高度控制请求参数不完整", _ERR_PLATFORM_INCOMPLETE),
+    "platformNum": ("无效的平台编号: %s", _ERR_PLATFORM_NUM),
+    "state": ("无效的平台控制状态: %s", _ERR_HEIGHT_STATE)
+})
 def platform_height_control():
     try:
-        data = request.get_json()
-        task_id = data.get('taskId')
-        defect_id = data.get('defectId')
-        platform_num = data.get('platformNum')
-        state = data.get('state')
+        task_id = g.data['taskId']
+        defect_id = g.data['defectId']
+        platform_num = g.data['platformNum']
+        state = g.data['state']
         
-        # 验证参数
-        if not all([task_id is not None, defect_id is not None, platform_num is not None, state]):
-            logging.error("平台高度控制请求参数不完整")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "请求参数不完整，需要taskId, defectId, platformNum和state字段"
-            }), 400
-            
-        # 验证platformNum值
-        if platform_num not in [1, 2]:
-            logging.error(f"无效的平台编号: {platform_num}")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "无效的platformNum值，必须为1或2"
-            }), 400
-            
-        # 验证state值
-        if state not in ["升高", "复位"]:
-            logging.error(f"无效的平台控制状态: {state}")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "无效的state值，必须为'升高'或'复位'"
-            }), 400
+        logging.info("收到平台高度控制请求 - 任务ID: %s, 缺陷ID: %s, "
+                     "平台号: %s, 状态: %s", task_id, defect_id, platform_num, state)
         
-        logging.info(f"收到平台高度控制请求 - 任务ID: {task_id}, 缺陷ID: {defect_id}, "
-                     f"平台号: {platform_num}, 状态: {state}")
-        
-        return jsonify({
-            "msg": "success",
-            "code": 200
-        })
+        return ok()
     except Exception as e:
-        logging.error(f"处理平台高度控制请求时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理平台高度控制请求时发生错误: %s", e)
+        return ojson({
             "msg": "error",
             "code": 500,
             "error": str(e)
-        }), 500
+        }, 500)
 
 
 @app.route('/stability/platformHorizontal/control', methods=['POST'])
+@validate(_HORIZONTAL_SCHEMA, {
+    None: ("平台调平控制请求参数不完整", _ERR_PLATFORM_INCOMPLETE),
+    "platformNum": ("无效的平台编号: %s", _ERR_PLATFORM_NUM),
+    "state": ("无效的调平控制状态: %s", _ERR_HORIZONTAL_STATE)
+})
 def platform_horizontal_control():
     try:
-        data = request.get_json()
-        task_id = data.get('taskId')
-        defect_id = data.get('defectId')
-        platform_num = data.get('platformNum')
-        state = data.get('state')
-        
-        # 验证参数
-        if not all([task_id is not None, defect_id is not None, platform_num is not None, state]):
-            logging.error("平台调平控制请求参数不完整")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "请求参数不完整，需要taskId, defectId, platformNum和state字段"
-            }), 400
-            
-        # 验证platformNum值
-        if platform_num not in [1, 2]:
-            logging.error(f"无效的平台编号: {platform_num}")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "无效的platformNum值，必须为1或2"
-            }), 400
-            
-        # 验证state值
-        if state not in ["调平", "调平复位"]:
-            logging.error(f"无效的调平控制状态: {state}")
-            return jsonify({
-                "msg": "error",
-                "code": 400,
-                "error": "无效的state值，必须为'调平'或'调平复位'"
-            }), 400
+        task_id = g.data['taskId']
+        defect_id = g.data['defectId']
+        platform_num = g.data['platformNum']
+        state = g.data['state']
         
-        logging.info(f"收到平台调平控制请求 - 任务ID: {task_id}, 缺陷ID: {defect_id}, "
-                     f"平台号: {platform_num}, 状态: {state}")
+        logging.info("收到平台调平控制请求 - 任务ID: %s, 缺陷ID: %s, "
+                     "平台号: %s, 状态: %s", task_id, defect_id, platform_num, state)
         
-        return jsonify({
-            "msg": "success",
-            "code": 200
-        })
+        return ok()
     except Exception as e:
-        logging.error(f"处理平台调平控制请求时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理平台调平控制请求时发生错误: %s", e)
+        return ojson({
             "msg": "error",
             "code": 500,
             "error": str(e)
-        }), 500
+        }, 500)
 
 @app.route('/stability/error/report', methods=['POST'])
 def error_report():
@@ -309,18 +460,18 @@ def error_report():
             except:
                 pass
                 
-        logging.info(f"收到错误报告 - 报警: {alarm} {state} {time_str}")
+        logging.info("收到错误报告 - 报警: %s %s %s", alarm, state, time_str)
 
-        return jsonify({
+        return ojson({
             "code": 200,
             "msg": "错误报告处理成功"
         })
     except Exception as e:
-        logging.error(f"处理错误报告时发生错误: {str(e)}")
-        return jsonify({
+        logging.error("处理错误报告时发生错误: %s", e)
+        return ojson({
             "code": 500,
             "msg": f"处理错误报告时发生错误: {str(e)}"
-        }), 500
+        }, 500)
 
 
 if __name__ == '__main__':
@@ -328,5 +479,5 @@ if __name__ == '__main__':
     host = '0.0.0.0'  # 监听所有网络接口
     port = 8080
 
-    logging.info(f"启动服务器: http://{host}:{port}/")
-    app.run(host=host, port=port, debug=True) 
\ No newline at end of file
+    logging.info("启动服务器: http://%s:%s/", host, port)
+    app.run(host=host, port=port, debug=False, use_reloader=False) 
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""模拟服务器控制接口的参数校验测试
+
+    python -m unittest test_server_validation
+"""
+import unittest
+
+import orjson
+
+from server_test import app
+
+_HEIGHT = "/stability/platformHeight/control"
+_SUPPORT = "/stability/support/control"
+
+_INCOMPLETE = "请求参数不完整，需要taskId, defectId, platformNum和state字段"
+_BAD_PLATFORM = "无效的platformNum值，必须为1或2"
+_BAD_STATE = "无效的state值，必须为'升高'或'复位'"
+
+
+class ControlValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def post(self, path, **fields):
+        data = {"taskId": 1, "defectId": 2, "platformNum": 1, "state": "升高"}
+        data.update(fields)
+        data = {k: v for k, v in data.items() if v is not ...}
+        return self.client.post(path, data=orjson.dumps(data), content_type="application/json")
+
+    def assertError(self, response, message):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(orjson.loads(response.data)["error"], message)
+
+    def test_valid_request(self):
+        self.assertEqual(self.post(_HEIGHT).status_code, 200)
+
+    def test_string_ids_accepted(self):
+        self.assertEqual(self.post(_HEIGHT, taskId="1", defectId="2").status_code, 200)
+
+    def test_missing_or_null_field_is_incomplete(self):
+        self.assertError(self.post(_HEIGHT, taskId=...), _INCOMPLETE)
+        self.assertError(self.post(_HEIGHT, defectId=None), _INCOMPLETE)
+        self.assertError(self.post(_HEIGHT, platformNum=None), _INCOMPLETE)
+
+    def test_falsy_state_is_incomplete(self):
+        for state in (None, "", 0, False):
+            with self.subTest(state=state):
+                self.assertError(self.post(_HEIGHT, state=state), _INCOMPLETE)
+
+    def test_incomplete_checked_before_platform_and_state(self):
+        self.assertError(self.post(_HEIGHT, taskId=None, platformNum=3, state="x"), _INCOMPLETE)
+
+    def test_platform_checked_before_state(self):
+        self.assertError(self.post(_HEIGHT, platformNum=3, state="x"), _BAD_PLATFORM)
+        self.assertError(self.post(_HEIGHT, platformNum="1"), _BAD_PLATFORM)
+
+    def test_invalid_state(self):
+        self.assertError(self.post(_HEIGHT, state="调平"), _BAD_STATE)
+
+    def test_support_falsy_state_is_incomplete(self):
+        response = self.post(_SUPPORT, platformNum=..., state=0)
+        self.assertError(response, "请求参数不完整，需要taskId, defectId和state字段")
+
+
+if __name__ == "__main__":
+    unittest.main()
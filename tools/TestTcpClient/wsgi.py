@@ -0,0 +1,12 @@
+"""模拟服务器的WSGI入口，用于在生产级WSGI服务器下运行server_test.py
+
+    gunicorn -k gthread -w 4 --threads 16 -b 0.0.0.0:8080 wsgi:app
+
+需要HTTP/2时改用hypercorn，明文连接下支持h2c，客户端设置STAB_CLIENT_HTTP2=1后
+全面测试的并发请求会复用同一连接：
+
+    hypercorn --workers 4 --bind 0.0.0.0:8080 wsgi:app
+
+直接运行 python server_test.py 仅适用于本地调试。
+"""
+from server_test import app